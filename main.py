@@ -1,14 +1,18 @@
 """
 Resume website: serves abbreviated resume and RAG-based Q&A using full resume + LangChain + TensorFlow.
 """
-import json
+import asyncio
+import hashlib
+import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+import msgspec
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
 
 from dotenv import load_dotenv
 
@@ -16,9 +20,25 @@ from dotenv import load_dotenv
 _project_root = Path(__file__).resolve().parent
 load_dotenv(_project_root / ".env")
 
-from rag import answer_question, warmup
+from rag import aanswer_question, astream_answer, is_ready, warmup
 
-app = FastAPI(title="Resume & Q&A", description="Resume display with AI Q&A over full resume data.")
+logger = logging.getLogger(__name__)
+
+
+def _log_warmup_result(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("RAG warmup failed; /api/ask will retry on demand: %s", task.exception())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the RAG chain in a background thread at startup so the port accepts connections during warmup."""
+    app.state.warmup_task = asyncio.create_task(asyncio.to_thread(warmup))
+    app.state.warmup_task.add_done_callback(_log_warmup_result)
+    yield
+
+
+app = FastAPI(title="Resume & Q&A", description="Resume display with AI Q&A over full resume data.", lifespan=lifespan)
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 STATIC_DIR = Path(__file__).resolve().parent / "static"
@@ -26,39 +46,104 @@ IMAGES_DIR = Path(__file__).resolve().parent / "images"
 ABBREV_RESUME_PATH = DATA_DIR / "resume-abbrev.json"
 
 
-class AskRequest(BaseModel):
+class AskRequest(msgspec.Struct):
     question: str
 
 
+# /api/ask decodes the body itself, so document it explicitly. Inline the definition: the top-level
+# "#/$defs/..." ref from msgspec would resolve against the OpenAPI document root.
+_ASK_REQUEST_SCHEMA = msgspec.json.schema(AskRequest)["$defs"]["AskRequest"]
+
+
+def _etag(content: bytes) -> str:
+    return '"' + hashlib.sha256(content).hexdigest() + '"'
+
+
+def _cached_response(request: Request, content: bytes, media_type: str, etag: str, max_age: int) -> Response:
+    """Serve preloaded bytes with an ETag, answering 304 when the client already has this version."""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    if etag in client_etags or "*" in client_etags:
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+# The abbreviated resume is static per deploy: read and validate it once at import
+_ABBREV_BYTES: bytes | None = None
+_ABBREV_ETAG = ""
+if ABBREV_RESUME_PATH.exists():
+    _ABBREV_BYTES = ABBREV_RESUME_PATH.read_bytes()
+    orjson.loads(_ABBREV_BYTES)
+    _ABBREV_ETAG = _etag(_ABBREV_BYTES)
+
+
 @app.get("/api/resume")
-def get_resume():
-    """Return the abbreviated resume (what the user sees on the page)."""
-    if not ABBREV_RESUME_PATH.exists():
+async def get_resume(request: Request):
+    """Return the abbreviated resume (what the user sees on the page). Served as the file's raw JSON bytes."""
+    if _ABBREV_BYTES is None:
         raise HTTPException(status_code=500, detail="Resume data not found.")
-    with open(ABBREV_RESUME_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _cached_response(request, _ABBREV_BYTES, "application/json", _ABBREV_ETAG, max_age=300)
 
 
-@app.post("/api/ask")
-def ask(req: AskRequest):
-    """Answer a question using augmented full resume data (RAG: TensorFlow embeddings + LangChain + LLM)."""
-    if not req.question or not req.question.strip():
+def _check_question(question: str, request: Request) -> None:
+    """Reject empty questions, and questions that arrive while the RAG chain is still warming up."""
+    if not question or not question.strip():
         raise HTTPException(status_code=400, detail="Question is required.")
+    warmup_task = getattr(request.app.state, "warmup_task", None)
+    if warmup_task is not None and not warmup_task.done():
+        raise HTTPException(status_code=503, detail="Q&A is warming up. Please try again in a moment.")
+
+
+def _ask_error(e: Exception) -> HTTPException:
+    """Map a failure while answering to the HTTP error shown to the user."""
+    err = str(e)
+    if isinstance(e, ValueError):
+        if "GOOGLE_API_KEY" in err or "GEMINI_API_KEY" in err:
+            return HTTPException(status_code=503, detail="Q&A is not configured (missing GOOGLE_API_KEY or GEMINI_API_KEY). Add it to .env and restart.")
+        return HTTPException(status_code=400, detail=err)
+    if "429" in err or "RESOURCE_EXHAUSTED" in err or "quota" in err.lower():
+        return HTTPException(
+            status_code=429,
+            detail="Gemini API quota exceeded. Please try again in a few minutes, or check your usage at https://ai.google.dev/gemini-api/docs/rate-limits",
+        )
+    return HTTPException(status_code=500, detail=f"Error answering question: {err}")
+
+
+@app.post(
+    "/api/ask",
+    openapi_extra={"requestBody": {"required": True, "content": {"application/json": {"schema": _ASK_REQUEST_SCHEMA}}}},
+)
+async def ask(request: Request):
+    """Answer a question using augmented full resume data (RAG: TensorFlow embeddings + LangChain + LLM)."""
+    # Decode straight into a msgspec Struct instead of going through Pydantic validation
+    try:
+        req = msgspec.json.decode(await request.body(), type=AskRequest)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    _check_question(req.question, request)
     try:
-        answer = answer_question(req.question)
-        return {"answer": answer}
-    except ValueError as e:
-        if "GOOGLE_API_KEY" in str(e) or "GEMINI_API_KEY" in str(e):
-            raise HTTPException(status_code=503, detail="Q&A is not configured (missing GOOGLE_API_KEY or GEMINI_API_KEY). Add it to .env and restart.")
-        raise HTTPException(status_code=400, detail=str(e))
+        answer = await aanswer_question(req.question)
     except Exception as e:
-        err = str(e)
-        if "429" in err or "RESOURCE_EXHAUSTED" in err or "quota" in err.lower():
-            raise HTTPException(
-                status_code=429,
-                detail="Gemini API quota exceeded. Please try again in a few minutes, or check your usage at https://ai.google.dev/gemini-api/docs/rate-limits",
-            )
-        raise HTTPException(status_code=500, detail=f"Error answering question: {err}")
+        raise _ask_error(e)
+    return Response(content=msgspec.json.encode({"answer": answer}), media_type="application/json")
+
+
+@app.get("/api/ask/stream")
+async def ask_stream(question: str, request: Request):
+    """Stream the answer as Server-Sent Events: `data: {"chunk": ...}` messages, then `event: done` (or `event: error`)."""
+    _check_question(question, request)
+
+    async def events():
+        try:
+            async for chunk in astream_answer(question):
+                yield b"data: " + orjson.dumps({"chunk": chunk}) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"detail": _ask_error(e).detail}) + b"\n\n"
+            return
+        yield b"event: done\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @app.get("/api/health")
@@ -74,21 +159,28 @@ def status():
 
 
 @app.get("/api/warmup")
-def api_warmup():
-    """Pre-load the RAG chain so the first Ask is fast. Call when the page loads."""
-    try:
-        warmup()
-        return {"status": "ok", "ready": True}
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=str(e))
+async def api_warmup(request: Request):
+    """Report whether the RAG chain is loaded. It is built in the background at startup, so this never blocks."""
+    warmup_task = getattr(request.app.state, "warmup_task", None)
+    if warmup_task is not None and warmup_task.done() and not warmup_task.cancelled() and warmup_task.exception() is not None:
+        raise HTTPException(status_code=503, detail=str(warmup_task.exception()))
+    return {"status": "ok", "ready": is_ready()}
+
+
+# index.html and the favicon are tiny and hit on every visit: keep them in memory instead of stat+open per request
+_INDEX_PATH = STATIC_DIR / "index.html"
+_FAVICON_PATH = STATIC_DIR / "favicon.svg"
+_INDEX_BYTES = _INDEX_PATH.read_bytes() if _INDEX_PATH.exists() else None
+_INDEX_ETAG = _etag(_INDEX_BYTES) if _INDEX_BYTES is not None else ""
+_FAVICON_BYTES = _FAVICON_PATH.read_bytes() if _FAVICON_PATH.exists() else None
+_FAVICON_ETAG = _etag(_FAVICON_BYTES) if _FAVICON_BYTES is not None else ""
 
 
 @app.get("/favicon.ico")
-def favicon():
+async def favicon(request: Request):
     """Serve favicon to avoid 404 when the browser requests it by default."""
-    favicon_path = STATIC_DIR / "favicon.svg"
-    if favicon_path.exists():
-        return FileResponse(favicon_path, media_type="image/svg+xml")
+    if _FAVICON_BYTES is not None:
+        return _cached_response(request, _FAVICON_BYTES, "image/svg+xml", _FAVICON_ETAG, max_age=86400)
     raise HTTPException(status_code=404)
 
 
@@ -102,9 +194,25 @@ if IMAGES_DIR.exists():
 
 
 @app.get("/")
-def index():
+async def index(request: Request):
     """Serve the main resume page."""
-    index_file = STATIC_DIR / "index.html"
-    if index_file.exists():
-        return FileResponse(index_file)
+    if _INDEX_BYTES is not None:
+        return _cached_response(request, _INDEX_BYTES, "text/html", _INDEX_ETAG, max_age=60)
     raise HTTPException(status_code=404, detail="Frontend not found. Create static/index.html.")
+
+
+if __name__ == "__main__":
+    import sys
+
+    import uvicorn
+
+    # uvloop + httptools (installed by uvicorn[standard]) cut per-request event-loop and HTTP parsing overhead.
+    # One worker: each worker process would load its own copy of the embedding model.
+    uvicorn.run(
+        "main:app",
+        host=os.environ.get("HOST", "127.0.0.1"),
+        port=int(os.environ.get("PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools",
+        workers=1,
+    )
@@ -1,139 +1,339 @@
 """
-RAG pipeline: TensorFlow Universal Sentence Encoder for embeddings,
-LangChain for retrieval + LLM-based answering. Uses full resume as augmented data.
+RAG pipeline: TensorFlow Universal Sentence Encoder for embeddings, an in-memory NumPy
+cosine-similarity retriever, and LangChain for LLM-based answering. Uses full resume as augmented data.
 """
-import json
+import asyncio
+import hashlib
 import os
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+import numpy as np
+import orjson
 from langchain_core.embeddings import Embeddings
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_chroma import Chroma
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; retrieval falls back to NumPy
+    njit = None
+
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 FULL_RESUME_PATH = DATA_DIR / "resume-full.json"
 RAG_FAQ_PATH = DATA_DIR / "rag-faq.json"
+VECTORS_PATH = DATA_DIR / "resume_vectors.int8.npy"
+SCALES_PATH = DATA_DIR / "resume_vectors.scales.npy"
+VECTORS_HASH_PATH = DATA_DIR / "resume_vectors.sha256"
+RETRIEVE_K = 4
+MAX_CONCURRENT_ANSWERS = 8
+ANSWER_CACHE_SIZE = 256
+
+
+_NO_EXTRA: dict = {}
+
+
+def _to_documents(buf: list[tuple[str, str, dict]]) -> list[Document]:
+    """Build Documents in one pass from (page_content, section, extra_metadata) tuples."""
+    return [Document(page_content=text, metadata={"section": section, **extra}) for text, section, extra in buf]
 
 
 def _faq_to_chunks(data: dict) -> list[Document]:
     """Convert FAQ Q&A JSON into RAG document chunks. Each chunk is 'Question: ... Answer: ...'."""
-    chunks = []
+    buf = []
+    add = buf.append
     for item in data.get("qa", []):
         q = item.get("question", "").strip()
         a = item.get("answer", "").strip()
         if q and a:
-            chunks.append(Document(
-                page_content=f"Question: {q}\nAnswer: {a}",
-                metadata={"section": "faq"}
-            ))
-    return chunks
+            add((f"Question: {q}\nAnswer: {a}", "faq", _NO_EXTRA))
+    return _to_documents(buf)
 
 
 def _resume_to_chunks(data: dict) -> list[Document]:
     """Flatten full resume JSON into text chunks for RAG."""
-    chunks = []
+    buf = []
+    add = buf.append
     # Profile
     p = data.get("profile", {})
     if p:
-        chunks.append(Document(
-            page_content=f"Profile: {p.get('name', '')}. Address: {p.get('address', '')}. Email: {p.get('email', '')}. Phone: {p.get('phone', '')}. LinkedIn: {p.get('linkedin', '')}.",
-            metadata={"section": "profile"}
-        ))
+        add((f"Profile: {p.get('name', '')}. Address: {p.get('address', '')}. Email: {p.get('email', '')}. Phone: {p.get('phone', '')}. LinkedIn: {p.get('linkedin', '')}.", "profile", _NO_EXTRA))
     # Summary
     s = data.get("summary", {})
     for key in ("technical_skills_experience", "key_strengths", "hobbies"):
-        if key in s and s[key]:
-            items = s[key] if isinstance(s[key], list) else [s[key]]
-            chunks.append(Document(page_content=f"Summary {key}: " + " ".join(items), metadata={"section": "summary"}))
+        items = s.get(key)
+        if items:
+            add((f"Summary {key}: " + (" ".join(items) if isinstance(items, list) else items), "summary", _NO_EXTRA))
     if s.get("next_great_challenge"):
-        chunks.append(Document(page_content="Next great challenge: " + s["next_great_challenge"], metadata={"section": "summary"}))
+        add(("Next great challenge: " + s["next_great_challenge"], "summary", _NO_EXTRA))
     # Technical summary
-    ts = data.get("technical_summary", {})
-    for category, items in ts.items():
+    for category, items in data.get("technical_summary", {}).items():
         if items:
-            text = " ".join(items) if isinstance(items, list) else str(items)
-            chunks.append(Document(page_content=f"Technical {category}: {text}", metadata={"section": "technical"}))
+            add((f"Technical {category}: " + (" ".join(items) if isinstance(items, list) else str(items)), "technical", _NO_EXTRA))
     # Education
     for ed in data.get("education", []):
-        chunks.append(Document(
-            page_content=f"Education: {ed.get('degree', '')} at {ed.get('school', '')}, {ed.get('date', '')}. {ed.get('gpa', '') or ed.get('notes', '')}.",
-            metadata={"section": "education"}
-        ))
+        add((f"Education: {ed.get('degree', '')} at {ed.get('school', '')}, {ed.get('date', '')}. {ed.get('gpa', '') or ed.get('notes', '')}.", "education", _NO_EXTRA))
     # Professional experience
     for job in data.get("professional_experience", []):
-        parts = [f"Company: {job.get('company', '')}. Role: {job.get('role', job.get('title', ''))}. Date: {job.get('date', '')}."]
-        if job.get("tech"):
-            parts.append("Tech: " + ", ".join(job["tech"]))
-        if job.get("tasks"):
-            parts.append("Tasks: " + " ".join(job["tasks"]))
-        if job.get("projects"):
-            for proj in job["projects"]:
-                parts.append(f"Project {proj.get('name', '')}: {proj.get('description', '')}")
-        chunks.append(Document(page_content=" ".join(parts), metadata={"section": "experience", "company": job.get("company", "")}))
+        company = job.get("company", "")
+        parts = [f"Company: {company}. Role: {job.get('role', job.get('title', ''))}. Date: {job.get('date', '')}."]
+        tech, tasks, projects = job.get("tech"), job.get("tasks"), job.get("projects")
+        if tech:
+            parts.append("Tech: " + ", ".join(tech))
+        if tasks:
+            parts.append("Tasks: " + " ".join(tasks))
+        if projects:
+            parts.extend(f"Project {proj.get('name', '')}: {proj.get('description', '')}" for proj in projects)
+        add((" ".join(parts), "experience", {"company": company}))
     # Training
     training = data.get("additional_training_education", [])
     if training:
-        chunks.append(Document(page_content="Additional training: " + "; ".join(training), metadata={"section": "training"}))
-    return chunks
+        add(("Additional training: " + "; ".join(training), "training", _NO_EXTRA))
+    return _to_documents(buf)
 
 
-def get_rag_chain():
-    """Build and return the RAG chain. Uses GOOGLE_API_KEY or GEMINI_API_KEY from env."""
-    # Lazy import so the app starts without loading TensorFlow (avoids pkg_resources at startup)
-    import tensorflow_hub as hub
+class TensorFlowHubEmbeddings(Embeddings):
+    """LangChain Embeddings using TensorFlow Hub Universal Sentence Encoder."""
+
+    def __init__(self, model_url: str = "https://tfhub.dev/google/universal-sentence-encoder/4", bf16: bool = False):
+        if bf16:
+            # oneDNN reads these when TensorFlow is first imported: run matmuls in BF16 with FP32 accumulation
+            os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "1")
+            os.environ.setdefault("ONEDNN_DEFAULT_FPMATH_MODE", "BF16")
+        # Lazy import so the app starts without loading TensorFlow (avoids pkg_resources at startup)
+        import tensorflow as tf
+        import tensorflow_hub as hub
+
+        try:
+            # One op at a time, each using every core: lowest latency for single-query embedding on CPU
+            tf.config.threading.set_inter_op_parallelism_threads(1)
+            tf.config.threading.set_intra_op_parallelism_threads(os.cpu_count() or 0)
+        except RuntimeError:
+            pass  # TensorFlow runtime already initialized; keep its thread pools
+        if bf16:
+            tf.config.optimizer.set_experimental_options({"auto_mixed_precision_onednn_bfloat16": True})
+        self._tf = tf
+        # Precision is part of the id so cached vectors are rebuilt when it changes
+        self.model_id = model_url + ("#bf16" if bf16 else "")
+        self._model = hub.load(model_url)
+        # Trace once against a fixed signature so calls skip the Hub dispatcher and never retrace
+        self._embed = tf.function(self._model, input_signature=[tf.TensorSpec([None], tf.string)])
+        self._embed(tf.constant(["warmup"]))
+
+    def embed_documents_np(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch in one model call and return the raw float32 ndarray (no list round-trip)."""
+        return self._embed(self._tf.constant(texts)).numpy()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_documents_np(texts).tolist()
+
+    def embed_query_np(self, text: str) -> np.ndarray:
+        """Embed one query as an L2-normalized, contiguous float32 vector, ready for the retriever."""
+        embedding = self._embed(self._tf.constant([text])).numpy()[0]
+        return np.ascontiguousarray(_normalize_rows(embedding), dtype=np.float32)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_query_np(text).tolist()
+
+
+class OnnxEmbeddings(Embeddings):
+    """LangChain Embeddings using an INT8-quantized ONNX sentence encoder (e.g. bge-small-en-v1.5) on CPU."""
+
+    def __init__(self, model_path: str, tokenizer_path: str | None = None, max_length: int = 512):
+        # Lazy imports: only needed when the ONNX embedder is selected
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
 
-    class TensorFlowHubEmbeddings(Embeddings):
-        """LangChain Embeddings using TensorFlow Hub Universal Sentence Encoder."""
+        self.model_id = Path(model_path).name
+        tokenizer_path = tokenizer_path or str(Path(model_path).with_name("tokenizer.json"))
+        self._tokenizer = Tokenizer.from_file(tokenizer_path)
+        self._tokenizer.enable_truncation(max_length=max_length)
+        self._tokenizer.enable_padding()
+        self._session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
 
-        def __init__(self, model_url: str = "https://tfhub.dev/google/universal-sentence-encoder/4"):
-            self._model = hub.load(model_url)
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        encoded = self._tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in encoded], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        last_hidden = self._session.run(None, feeds)[0]
+        # Mean-pool over real tokens, then L2-normalize
+        m = mask[:, :, None].astype(np.float32)
+        pooled = (last_hidden * m).sum(axis=1) / np.maximum(m.sum(axis=1), 1e-9)
+        return pooled / np.linalg.norm(pooled, axis=1, keepdims=True)
 
-        def embed_documents(self, texts: list[str]) -> list[list[float]]:
-            embeddings = self._model(texts).numpy()
-            return embeddings.tolist()
+    def embed_documents_np(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch in one session run and return the raw float32 ndarray (no list round-trip)."""
+        return self._embed(texts)
 
-        def embed_query(self, text: str) -> list[float]:
-            embedding = self._model([text]).numpy()[0]
-            return embedding.tolist()
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embed(texts).tolist()
 
-    with open(FULL_RESUME_PATH, "r", encoding="utf-8") as f:
-        full_resume = json.load(f)
+    def embed_query_np(self, text: str) -> np.ndarray:
+        """Embed one query as an L2-normalized, contiguous float32 vector, ready for the retriever."""
+        return np.ascontiguousarray(self._embed([text])[0], dtype=np.float32)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_query_np(text).tolist()
+
+
+def _get_embeddings() -> TensorFlowHubEmbeddings | OnnxEmbeddings:
+    """Use the quantized ONNX embedder when EMBEDDINGS_ONNX_MODEL is set, else TensorFlow Hub USE (BF16 if EMBEDDINGS_BF16 is set)."""
+    onnx_model = os.environ.get("EMBEDDINGS_ONNX_MODEL")
+    if onnx_model:
+        return OnnxEmbeddings(onnx_model, os.environ.get("EMBEDDINGS_ONNX_TOKENIZER"))
+    return TensorFlowHubEmbeddings(bf16=os.environ.get("EMBEDDINGS_BF16", "").lower() in ("1", "true", "yes"))
+
+
+def _chunks_hash(chunks: list[Document], model_id: str) -> str:
+    """SHA-256 over the embedding model and chunk contents/metadata, used to tell whether the persisted vectors are still current."""
+    h = hashlib.sha256(model_id.encode("utf-8"))
+    h.update(b"\0")
+    for d in chunks:
+        h.update(d.page_content.encode("utf-8"))
+        h.update(b"\0")
+        h.update(orjson.dumps(d.metadata, option=orjson.OPT_SORT_KEYS))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _load_chunks() -> list[Document]:
+    """Build the resume + FAQ chunks from the source JSON files."""
+    full_resume = orjson.loads(FULL_RESUME_PATH.read_bytes())
     chunks = _resume_to_chunks(full_resume)
     if not chunks:
         raise ValueError("No resume chunks loaded.")
 
     if RAG_FAQ_PATH.exists():
-        with open(RAG_FAQ_PATH, "r", encoding="utf-8") as f:
-            faq_data = json.load(f)
+        faq_data = orjson.loads(RAG_FAQ_PATH.read_bytes())
         faq_chunks = _faq_to_chunks(faq_data)
         chunks = chunks + faq_chunks
+    return chunks
+
+
+def _normalize_rows(x: np.ndarray) -> np.ndarray:
+    """L2-normalize a vector or each row of a matrix so dot products are cosine similarities."""
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def _quantize_rows(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric INT8 quantization of a vector or each matrix row; returns (int8 values, float32 scale per row)."""
+    scales = (np.maximum(np.abs(x).max(axis=-1, keepdims=True), 1e-12) / 127).astype(np.float32)
+    return np.round(x / scales).astype(np.int8), scales.squeeze(-1)
+
+
+def _int8_scores_numpy(matrix_q: np.ndarray, scales: np.ndarray, query_q: np.ndarray, query_scale: float) -> np.ndarray:
+    """Cosine scores from INT8 corpus and query: int32-accumulated dot products rescaled by both scales."""
+    # einsum accumulates in int32 directly, without an int32 copy of the whole corpus per query
+    return np.einsum("ij,j->i", matrix_q, query_q, dtype=np.int32) * scales * query_scale
+
+
+def _int8_scores_kernel(matrix_q, scales, query_q, query_scale):
+    # Same result as _int8_scores_numpy, but accumulates in place without an int32 copy of the corpus
+    n, dim = matrix_q.shape
+    out = np.empty(n, dtype=np.float32)
+    for i in range(n):
+        acc = 0
+        for j in range(dim):
+            acc += np.int32(matrix_q[i, j]) * np.int32(query_q[j])
+        out[i] = acc * scales[i] * query_scale
+    return out
+
+
+_int8_scores = njit(cache=True, fastmath=True)(_int8_scores_kernel) if njit is not None else _int8_scores_numpy
 
-    embeddings = TensorFlowHubEmbeddings()
-    # Use fresh path to avoid "default_tenant" errors from old ChromaDB 1.x data
-    import chromadb
-    chroma_path = str(DATA_DIR / "chroma_db_v2")
-    client = chromadb.PersistentClient(path=chroma_path)
-    vectorstore = Chroma.from_documents(
-        documents=chunks,
-        embedding=embeddings,
-        collection_name="resume_rag",
-        client=client,
-    )
-    retriever = vectorstore.as_retriever(search_k=4)
-
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are a helpful assistant answering questions about Joseph Beyer's resume and career.
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    k = min(k, len(scores))
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+def _load_or_build_vectors(chunks: list[Document], embeddings: Embeddings) -> tuple[np.ndarray, np.ndarray]:
+    """Return the INT8 [N, dim] chunk index and its per-row scales, memory-mapping the on-disk copy when chunks are unchanged."""
+    # Chunks are static per deploy: reuse the persisted vectors when they match, so restarts skip USE inference
+    chunks_hash = _chunks_hash(chunks, embeddings.model_id)
+    stored_hash = VECTORS_HASH_PATH.read_text(encoding="utf-8").strip() if VECTORS_HASH_PATH.exists() else None
+    if stored_hash == chunks_hash and VECTORS_PATH.exists() and SCALES_PATH.exists():
+        matrix_q = np.asarray(np.load(VECTORS_PATH, mmap_mode="r"))
+        scales = np.load(SCALES_PATH)
+        if matrix_q.shape[0] == len(chunks) == scales.shape[0]:
+            return matrix_q, scales
+    matrix = _normalize_rows(np.asarray(embeddings.embed_documents_np([d.page_content for d in chunks]), dtype=np.float32))
+    # Keep the corpus as INT8 with per-row scales (4x smaller); scores are rescaled from int32 dot products
+    matrix_q, scales = _quantize_rows(np.ascontiguousarray(matrix))
+    np.save(VECTORS_PATH, matrix_q)
+    np.save(SCALES_PATH, scales)
+    VECTORS_HASH_PATH.write_text(chunks_hash, encoding="utf-8")
+    return matrix_q, scales
+
+
+_SYSTEM_PROMPT = """You are a helpful assistant answering questions about Joseph Beyer's resume and career.
 Use ONLY the following retrieved context (from his full resume and/or FAQ Q&A) to answer.
 When the context includes a "Question: ... Answer: ..." block that matches the user's question, prefer that answer.
 If the context does not contain enough information, say so briefly and answer from common sense where reasonable.
-Keep answers concise and professional. If the question is off-topic or inappropriate, politely redirect to resume-related topics."""),
-        ("human", "Context from resume and FAQ:\n{context}\n\nQuestion: {question}")
-    ])
+Keep answers concise and professional. If the question is off-topic or inappropriate, politely redirect to resume-related topics."""
+_HUMAN_TEMPLATE = "Context from resume and FAQ:\n{context}\n\nQuestion: {question}"
+
+
+def _message_text(message: BaseMessage) -> str:
+    """Plain text of an LLM message, whether content is a string or a list of content blocks."""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content:
+        if isinstance(block, str):
+            parts.append(block)
+        elif block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "".join(parts)
+
+
+class RagChain:
+    """Retrieve -> prompt -> LLM as plain calls; the pipeline shape is fixed, so no LCEL Runnable wrappers."""
+
+    def __init__(self, retrieve, llm: BaseChatModel):
+        self._retrieve = retrieve
+        self._llm = llm
+
+    def _messages(self, question: str) -> list[BaseMessage]:
+        context = "\n\n".join(d.page_content for d in self._retrieve(question))
+        return [SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=_HUMAN_TEMPLATE.format(context=context, question=question))]
+
+    async def astream(self, question: str):
+        """Yield the answer text incrementally as the LLM produces it."""
+        # Retrieval is CPU-bound (query embedding): keep it off the event loop
+        messages = await asyncio.to_thread(self._messages, question)
+        async for chunk in self._llm.astream(messages):
+            text = _message_text(chunk)
+            if text:
+                yield text
+
+
+def get_rag_chain() -> RagChain:
+    """Build and return the RAG chain. Uses GOOGLE_API_KEY or GEMINI_API_KEY from env."""
+    chunks = _load_chunks()
+    embeddings = _get_embeddings()
+    matrix_q, scales = _load_or_build_vectors(chunks, embeddings)
+    # Trigger the numba compile (or load it from the on-disk cache) now rather than on the first question.
+    # Quantize a dummy query the same way retrieve() does so the argument types match the real specialization.
+    _int8_scores(matrix_q, scales, *_quantize_rows(np.ones(matrix_q.shape[1], dtype=np.float32)))
+
+    def retrieve(question: str) -> list[Document]:
+        query_q, query_scale = _quantize_rows(embeddings.embed_query_np(question))
+        scores = _int8_scores(matrix_q, scales, query_q, query_scale)
+        return [chunks[i] for i in _top_k(scores, RETRIEVE_K)]
 
     api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
     # Use gemini-2.5-flash (gemini-1.5-flash is deprecated / 404)
@@ -141,33 +341,94 @@ Keep answers concise and professional. If the question is off-topic or inappropr
     if not api_key:
         raise ValueError("GOOGLE_API_KEY or GEMINI_API_KEY environment variable is not set. Add it to .env or your environment.")
 
-    def format_docs(docs):
-        return "\n\n".join(d.page_content for d in docs)
-
-    chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
-    return chain
+    return RagChain(retrieve, llm)
 
 
 _chain = None
+# Serializes chain construction so the startup warmup thread and /api/warmup don't both load the model
+_chain_lock = threading.Lock()
+# Bounds in-flight LLM calls from the async path
+_answer_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANSWERS)
+# LRU of final answers keyed by normalized question; visitors mostly ask the same handful of questions
+_answer_cache: OrderedDict[str, str] = OrderedDict()
+_answer_cache_lock = threading.Lock()
 
 
-def warmup() -> None:
-    """Pre-load the RAG chain at startup so the first /api/ask request doesn't timeout (TensorFlow + Chroma load is slow)."""
+def _normalize_question(question: str) -> str:
+    return re.sub(r"\s+", " ", question.strip().lower())
+
+
+def _cached_answer(key: str) -> str | None:
+    with _answer_cache_lock:
+        answer = _answer_cache.get(key)
+        if answer is not None:
+            _answer_cache.move_to_end(key)
+        return answer
+
+
+def _remember_answer(key: str, answer: str) -> None:
+    with _answer_cache_lock:
+        _answer_cache[key] = answer
+        _answer_cache.move_to_end(key)
+        if len(_answer_cache) > ANSWER_CACHE_SIZE:
+            _answer_cache.popitem(last=False)
+
+
+def _get_chain():
+    """Return the RAG chain, building it on first use."""
     global _chain
+    if _chain is None:
+        with _chain_lock:
+            if _chain is None:
+                _chain = get_rag_chain()
+    return _chain
+
+
+def is_ready() -> bool:
+    """Whether the RAG chain has been built."""
+    return _chain is not None
+
+
+def warmup() -> None:
+    """Pre-load the RAG chain at startup so the first /api/ask request doesn't timeout (TensorFlow load + embedding is slow)."""
     if _chain is None:
         api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
         if api_key and api_key.strip() and api_key != "your-gemini-key-here":
-            _chain = get_rag_chain()
+            _get_chain()
 
 
-def answer_question(question: str) -> str:
-    """Answer a question using the RAG chain (full resume + LLM)."""
-    global _chain
-    if _chain is None:
-        _chain = get_rag_chain()
-    return _chain.invoke(question.strip())
+async def astream_answer(question: str):
+    """Stream the answer text for a question; cached answers are yielded whole, fresh ones cached once complete."""
+    key = _normalize_question(question)
+    answer = _cached_answer(key)
+    if answer is not None:
+        yield answer
+        return
+    chain = _chain if _chain is not None else await asyncio.to_thread(_get_chain)
+    # Only the LLM call holds a concurrency slot: it drains into an unbounded queue, so a slow
+    # client reading the stream can't keep the slot (and block other questions) while it catches up
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async with _answer_semaphore:
+                async for text in chain.astream(question.strip()):
+                    queue.put_nowait(text)
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    parts = []
+    try:
+        while (text := await queue.get()) is not None:
+            parts.append(text)
+            yield text
+        await producer  # re-raise any LLM error
+    finally:
+        producer.cancel()  # client went away mid-stream: stop the LLM call
+    _remember_answer(key, "".join(parts))
+
+
+async def aanswer_question(question: str) -> str:
+    """Answer a question in full; collects astream_answer, so caching and concurrency limits apply the same way."""
+    return "".join([text async for text in astream_answer(question)])